@@ -0,0 +1,87 @@
+from fastapi import APIRouter, HTTPException, Query
+from ..container import get_analytics
+
+router = APIRouter()
+
+def _ticker(node: dict) -> str:
+    return node['symbol'].replace(".NS", "")
+
+def _node_index(graph, ticker: str) -> int:
+    symbol = ticker if ".NS" in ticker else f"{ticker}.NS"
+    for node in graph.nodes:
+        if node['symbol'] == symbol:
+            return node['id']
+    raise HTTPException(status_code=404, detail=f"Stock {ticker} not found")
+
+@router.get("/analytics/centrality")
+async def get_centrality(limit: int = Query(20, ge=1, le=500), sort_by: str = "pagerank"):
+    """Most systemically important stocks in the correlation graph"""
+    if sort_by not in ("pagerank", "eigenvector", "degree"):
+        raise HTTPException(status_code=400, detail="sort_by must be one of: pagerank, eigenvector, degree")
+
+    graph, scores = await get_analytics().centrality()
+    ranking = sorted(range(len(graph.nodes)), key=lambda i: scores[sort_by][i], reverse=True)
+    return {
+        "version": graph.version,
+        "stocks": [
+            {
+                "ticker": _ticker(graph.nodes[i]),
+                "name": graph.nodes[i]['name'],
+                "sector": graph.nodes[i]['sector'],
+                "pagerank": scores['pagerank'][i],
+                "eigenvector": scores['eigenvector'][i],
+                "degree": scores['degree'][i]
+            }
+            for i in ranking[:limit]
+        ]
+    }
+
+@router.get("/analytics/communities")
+async def get_communities():
+    """Co-movement clusters compared with the static sector labels"""
+    graph, result = await get_analytics().communities()
+    return {
+        "version": graph.version,
+        "modularity": result['modularity'],
+        "sector_agreement": result['sector_agreement'],
+        "communities": [
+            {
+                **community,
+                "members": [_ticker(graph.nodes[i]) for i in community['members']]
+            }
+            for community in result['communities']
+        ]
+    }
+
+@router.get("/analytics/mst")
+async def get_minimum_spanning_tree():
+    """Backbone of the market: the minimum spanning tree over correlation distance"""
+    graph, edges = await get_analytics().mst()
+    return {
+        "version": graph.version,
+        "edges": [
+            {
+                "source": _ticker(graph.nodes[a]),
+                "target": _ticker(graph.nodes[b]),
+                "correlation": w
+            }
+            for a, b, w in edges
+        ]
+    }
+
+@router.get("/analytics/contagion-path")
+async def get_contagion_path(source: str, target: str):
+    """Strongest chain of co-movements through which a shock could spread from source to target"""
+    analytics = get_analytics()
+    graph = await analytics.get_graph()
+    source_id = _node_index(graph, source)
+    target_id = _node_index(graph, target)
+
+    result = analytics.contagion_path(graph, source_id, target_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No path between {source} and {target}")
+    return {
+        "version": graph.version,
+        "path": [_ticker(graph.nodes[i]) for i in result['path']],
+        "distance": result['distance']
+    }
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, HTTPException, Response
+from ..container import get_graph_service
+
+router = APIRouter()
+
+BINARY_MEDIA_TYPE = "application/octet-stream"
+
+def _binary_response(level: str) -> Response:
+    payload = get_graph_service().get_binary(level)
+    return Response(content=payload, media_type=BINARY_MEDIA_TYPE)
+
+@router.get("/graph")
+def get_graph(level: str = "stocks", format: str = "json"):
+    """
+    Correlation graph with server-side 3D layout.
+    level: stocks (full resolution) or sectors (one node per sector)
+    format: json or binary (see correlation_graph.py for the byte layout)
+    """
+    if level not in ("stocks", "sectors"):
+        raise HTTPException(status_code=400, detail="level must be one of: stocks, sectors")
+    if format not in ("json", "binary"):
+        raise HTTPException(status_code=400, detail="format must be one of: json, binary")
+
+    if format == "binary":
+        return _binary_response(level)
+    if level == "sectors":
+        return get_graph_service().get_sector_view()
+    return get_graph_service().get_stock_view()
+
+@router.get("/graph/sectors/{sector}")
+def expand_sector(sector: str):
+    """Expand a sector node into its member stocks"""
+    expansion = get_graph_service().expand_sector(sector)
+    if expansion is None:
+        raise HTTPException(status_code=404, detail=f"Sector {sector} not found")
+    return expansion
@@ -0,0 +1,33 @@
+import asyncio
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from ..jobs import submit_job, get_job_status, job_names, UnknownJobError, InvalidJobParamsError
+
+router = APIRouter()
+
+class JobRequest(BaseModel):
+    task: str
+    params: Optional[Dict[str, Any]] = None
+
+@router.get("/jobs/tasks")
+async def list_job_tasks():
+    """Job names accepted by POST /jobs"""
+    return job_names()
+
+@router.post("/jobs", status_code=202)
+async def create_job(request: JobRequest):
+    """Queue a background job; identical pending jobs are shared rather than duplicated"""
+    try:
+        # In eager mode the job runs during submission, so keep it off the event loop
+        return await asyncio.to_thread(submit_job, request.task, request.params)
+    except (UnknownJobError, InvalidJobParamsError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Poll job status; includes the result once the job has finished"""
+    status = await asyncio.to_thread(get_job_status, job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return status
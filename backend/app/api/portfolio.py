@@ -2,13 +2,9 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict
 from ..data.indian_stocks import get_stock_by_symbol
-from ..utils.stock_fetcher import StockDataFetcher
-
-from ..utils.gemini_ai import GeminiAI
+from ..container import get_fetcher, get_gemini
 
 router = APIRouter()
-fetcher = StockDataFetcher()
-gemini = GeminiAI()
 
 class Holding(BaseModel):
     ticker: str
@@ -24,17 +20,14 @@ class PortfolioAnalysisResponse(BaseModel):
     recommendations: List[str]
     sector_allocation: Dict[str, float]
 
-@router.post("/portfolio/analyze", response_model=PortfolioAnalysisResponse)
-async def analyze_portfolio(request: PortfolioAnalysisRequest):
-    if not request.holdings:
-        raise HTTPException(status_code=400, detail="No holdings provided")
-    
+def analyze_holdings(holdings: List[Holding]) -> PortfolioAnalysisResponse:
+    """Price the holdings, compute sector allocation and ask Gemini for a health check"""
     # Calculate total portfolio value using real stock prices
     total_value = 0
     sector_values = {}
     enriched_holdings = []
     
-    for holding in request.holdings:
+    for holding in holdings:
         symbol = holding.ticker if ".NS" in holding.ticker else f"{holding.ticker}.NS"
         stock_info = get_stock_by_symbol(symbol)
         
@@ -45,7 +38,7 @@ async def analyze_portfolio(request: PortfolioAnalysisRequest):
         if stock_info:
             sector = stock_info[2]
             # Get real stock data
-            stock_data = fetcher.get_stock_price(symbol)
+            stock_data = get_fetcher().get_stock_price(symbol)
             if stock_data:
                 current_price = stock_data['current_price']
             
@@ -71,7 +64,7 @@ async def analyze_portfolio(request: PortfolioAnalysisRequest):
     } if total_value > 0 else {}
     
     # Get AI Analysis
-    ai_analysis = gemini.analyze_portfolio_health(enriched_holdings)
+    ai_analysis = get_gemini().analyze_portfolio_health(enriched_holdings)
     
     return PortfolioAnalysisResponse(
         risk_score=ai_analysis.get('risk_score', 5.0),
@@ -79,3 +72,9 @@ async def analyze_portfolio(request: PortfolioAnalysisRequest):
         recommendations=ai_analysis.get('recommendations', ["Diversify your portfolio across multiple sectors."]),
         sector_allocation=sector_allocation
     )
+
+@router.post("/portfolio/analyze", response_model=PortfolioAnalysisResponse)
+async def analyze_portfolio(request: PortfolioAnalysisRequest):
+    if not request.holdings:
+        raise HTTPException(status_code=400, detail="No holdings provided")
+    return analyze_holdings(request.holdings)
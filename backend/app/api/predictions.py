@@ -1,16 +1,32 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional
+import asyncio
+import logging
+import os
 import random
-from ..ml.predictor import StockPredictor
+import time
+from ..ml.leaderboard import publish_prediction, publish_predictions, sync_leaderboard
 from ..data.indian_stocks import get_all_stocks, get_stock_by_symbol
-from ..utils.stock_fetcher import StockDataFetcher
-from ..utils.gemini_ai import GeminiAI
+from ..container import get_fetcher, get_gemini, get_store
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
-predictor = StockPredictor()
-fetcher = StockDataFetcher()
-gemini = GeminiAI()
+
+# Interval between universe-wide sweeps; every sweep downloads the latest prices
+PREDICTION_REFRESH_SECONDS = 300
+# How often each worker checks whether a sweep is due
+PREDICTION_REFRESH_POLL_SECONDS = 30
+# Set for PREDICTION_REFRESH_SECONDS after each completed sweep
+PREDICTION_REFRESHED_KEY = "stockgraph:predictions:refreshed"
+# Held by whichever process runs the current sweep and released when it ends;
+# the TTL only matters if that process dies mid-sweep, so it is well past the
+# slowest batched download
+PREDICTION_REFRESH_LOCK_KEY = "stockgraph:predictions:refresh-lock"
+PREDICTION_REFRESH_LOCK_SECONDS = 900
+# Explanations are keyed by ticker and predicted change, so a new prediction gets a new one
+EXPLANATION_TTL_SECONDS = 3600
 
 class PredictionRequest(BaseModel):
     ticker: str
@@ -53,7 +69,7 @@ async def get_live_stock_data():
     
     live_data = []
     for symbol_full, name, sector in stocks[:10]:
-        data = fetcher.get_stock_price(symbol_full)
+        data = get_fetcher().get_stock_price(symbol_full)
         if data:
             live_data.append({
                 **data,
@@ -70,92 +86,117 @@ async def predict_stock(request: PredictionRequest):
         
         # Get stock info from our list
         stock_info = get_stock_by_symbol(symbol)
-        sector = stock_info[2] if stock_info else "Unknown"
-        
-        # Get real stock data
-        stock_data = fetcher.get_stock_price(symbol)
-        
-        if not stock_data:
-            raise HTTPException(status_code=404, detail=f"Stock {request.ticker} not found")
-        
-        # Mock prediction logic (in production, use the trained GNN model)
-        current_price = stock_data['current_price']
-        change_percent = random.uniform(-0.03, 0.05)  # Slight upward bias
-        predicted_price = current_price * (1 + change_percent)
-        
-        # Generate AI explanation using Gemini
-        explanation = gemini.generate_prediction_explanation(
-            stock_name=stock_data['name'],
-            current_price=current_price,
-            predicted_change=change_percent * 100,
-            sector=sector
-        )
-        
+
+        # Serve the same prediction that the top-movers leaderboard shows
+        prediction = sync_leaderboard().get(symbol.replace(".NS", "")) if stock_info else None
+
+        if prediction is None:
+            # Get real stock data
+            stock_data = get_fetcher().get_stock_price(symbol)
+
+            if not stock_data:
+                raise HTTPException(status_code=404, detail=f"Stock {request.ticker} not found")
+
+            if stock_info:
+                prediction = build_prediction(symbol, stock_info[1], stock_info[2], stock_data)
+                publish_prediction(prediction)
+            else:
+                prediction = build_prediction(symbol, stock_data['name'], "Unknown", stock_data)
+
         return PredictionResponse(
             ticker=request.ticker,
-            name=stock_data['name'],
-            current_price=current_price,
-            predicted_price=round(predicted_price, 2),
-            predicted_change=round(change_percent * 100, 2),
-            confidence=random.uniform(0.75, 0.92),
-            explanation=explanation
+            name=prediction['name'],
+            current_price=prediction['current_price'],
+            predicted_price=prediction['predicted_price'],
+            predicted_change=prediction['predicted_change'],
+            confidence=prediction['confidence'],
+            explanation=get_explanation(prediction)
         )
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/predictions/top-movers")
-async def get_top_movers():
-    """Get stocks with biggest predicted movements"""
+def build_prediction(symbol_full: str, name: str, sector: str, stock_data: dict) -> dict:
+    """Mock prediction for one ticker (in production, use the trained GNN model)"""
+    current_price = stock_data['current_price']
+    change_percent = random.uniform(-0.04, 0.06)
+    predicted_price = current_price * (1 + change_percent)
+
+    return {
+        "ticker": symbol_full.replace(".NS", ""),
+        "name": name,
+        "sector": sector,
+        "current_price": current_price,
+        "predicted_price": round(predicted_price, 2),
+        "predicted_change": round(change_percent * 100, 2),
+        "confidence": random.uniform(0.7, 0.95)
+    }
+
+def get_explanation(prediction: dict) -> str:
+    """Gemini explanation for a prediction, reusing one already generated (or prefetched) for it"""
+    key = f"stockgraph:explanation:{prediction['ticker']}:{prediction['predicted_change']}"
+    store = get_store()
+    explanation = store.get(key)
+    if explanation is None:
+        explanation = get_gemini().generate_prediction_explanation(
+            stock_name=prediction['name'],
+            current_price=prediction['current_price'],
+            predicted_change=prediction['predicted_change'],
+            sector=prediction['sector']
+        )
+        store.set(key, explanation, ex=EXPLANATION_TTL_SECONDS)
+    return explanation
+
+def refresh_all_predictions() -> List[dict]:
+    """Re-predict every tracked stock from one batched price download and publish the whole sweep at once"""
     stocks = get_all_stocks()
-    predictions = []
-    
-    for symbol_full, name, sector in stocks[:20]:  # Get top 20
+    prices = get_fetcher().get_stock_prices([stock[0] for stock in stocks])
+    refreshed = []
+    for symbol_full, name, sector in stocks:
+        # Keep the last good prediction rather than ranking a made-up price
+        if symbol_full in prices:
+            refreshed.append(build_prediction(symbol_full, name, sector, prices[symbol_full]))
+    publish_predictions(refreshed)
+    return refreshed
+
+async def refresh_predictions_periodically(interval_seconds: int = PREDICTION_REFRESH_SECONDS):
+    """
+    Keep the shared predictions warm without blocking the event loop. Every
+    web worker runs this loop, but a sweep only starts once the last one is
+    `interval_seconds` old, and only in the worker that takes the lock.
+    """
+    token = os.getpid()
+    while True:
         try:
-            stock_data = fetcher.get_stock_price(symbol_full)
-            if stock_data:
-                # Mock prediction
-                current_price = stock_data['current_price']
-                change_percent = random.uniform(-0.04, 0.06)
-                if data:
-                    current_price = data['current_price']
-                else:
-                    # Fallback to mock price if fetch fails
-                    current_price = random.uniform(100, 3000)
-
-                change_percent = random.uniform(-0.04, 0.06)
-                predicted_price = current_price * (1 + change_percent)
-                
-                predictions.append({
-                    "ticker": symbol_full.replace(".NS", ""),
-                    "name": name,
-                    "sector": sector,
-                    "current_price": current_price,
-                    "predicted_price": round(predicted_price, 2),
-                    "predicted_change": round(change_percent * 100, 2),
-                    "confidence": random.uniform(0.7, 0.95)
-                })
-        except Exception as e:
-            print(f"Error processing {symbol_full}: {e}")
-            continue
-    
-    # If strictly no predictions, generate entirely mock ones
-    if not predictions:
-        for symbol_full, name, sector in stocks[:5]:
-            predictions.append({
-                "ticker": symbol_full.replace(".NS", ""),
-                "name": name,
-                "sector": sector,
-                "current_price": random.uniform(500, 2500),
-                "predicted_price": random.uniform(500, 2500),
-                "predicted_change": random.uniform(-5.0, 5.0),
-                "confidence": 0.85
-            })
+            store = get_store()
+            if store.get(PREDICTION_REFRESHED_KEY) is None and \
+                    store.set_nx(PREDICTION_REFRESH_LOCK_KEY, token, ex=PREDICTION_REFRESH_LOCK_SECONDS):
+                try:
+                    await asyncio.to_thread(refresh_all_predictions)
+                    store.set(PREDICTION_REFRESHED_KEY, time.time(), ex=interval_seconds)
+                finally:
+                    store.delete_if_equal(PREDICTION_REFRESH_LOCK_KEY, token)
+        except Exception:
+            # A failed sweep or a store outage must not end the loop
+            logger.exception("Prediction refresh failed")
+        await asyncio.sleep(PREDICTION_REFRESH_POLL_SECONDS)
 
-    # Sort by absolute change
-    predictions.sort(key=lambda x: abs(x['predicted_change']), reverse=True)
-    return predictions[:10]
+@router.get("/predictions/top-movers")
+async def get_top_movers(
+    limit: int = Query(10, ge=1, le=100),
+    sector: Optional[str] = None,
+    view: str = "movers"
+):
+    """Get stocks with biggest predicted movements, served from the in-memory leaderboard"""
+    leaderboard = sync_leaderboard()
+    if view == "movers":
+        return leaderboard.top_movers(limit, sector)
+    if view == "gainers":
+        return leaderboard.top_gainers(limit, sector)
+    if view == "losers":
+        return leaderboard.top_losers(limit, sector)
+    raise HTTPException(status_code=400, detail="view must be one of: movers, gainers, losers")
 
 @router.get("/market-insight")
 async def get_market_insight():
@@ -167,7 +208,7 @@ async def get_market_insight():
         market_data = []
         
         for symbol_full, name, sector in sample_stocks:
-            data = fetcher.get_stock_price(symbol_full)
+            data = get_fetcher().get_stock_price(symbol_full)
             if data:
                 market_data.append(data)
         
@@ -179,7 +220,7 @@ async def get_market_insight():
                 "summary": "Market data unavailable for real-time analysis, but trends indicate mixed signals across major sectors."
             }
 
-        result = gemini.analyze_market_sentiment(market_data)
+        result = get_gemini().analyze_market_sentiment(market_data)
         return result
     except Exception as e:
         print(f"Error generating insight: {e}")
@@ -2,9 +2,14 @@ from fastapi import APIRouter, WebSocket
 import asyncio
 import random
 from typing import List
+from ..jobs import get_job_status
 
 router = APIRouter()
 
+JOB_POLL_SECONDS = 1
+# Stop watching after this long even if the job is still running
+JOB_WATCH_TIMEOUT_SECONDS = 600
+
 @router.websocket("/ws/predictions")
 async def websocket_predictions(websocket: WebSocket):
     await websocket.accept()
@@ -27,3 +32,30 @@ async def websocket_predictions(websocket: WebSocket):
     except Exception as e:
         print(f"WebSocket error: {e}")
         pass
+
+@router.websocket("/ws/jobs/{job_id}")
+async def websocket_job_status(websocket: WebSocket, job_id: str):
+    """Push job status changes until the job finishes or the watch times out"""
+    await websocket.accept()
+    try:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + JOB_WATCH_TIMEOUT_SECONDS
+        last_state = None
+        while True:
+            status = await asyncio.to_thread(get_job_status, job_id)
+            if status is None:
+                await websocket.send_json({"type": "job_error", "detail": f"Job {job_id} not found"})
+                break
+            if status["status"] != last_state:
+                await websocket.send_json({"type": "job_update", "data": status})
+                last_state = status["status"]
+            if status["ready"]:
+                break
+            if loop.time() >= deadline:
+                await websocket.send_json({"type": "job_error", "detail": "Timed out waiting for job"})
+                break
+            await asyncio.sleep(JOB_POLL_SECONDS)
+        await websocket.close()
+    except Exception as e:
+        print(f"WebSocket error: {e}")
+        pass
@@ -0,0 +1,27 @@
+import os
+from celery import Celery
+
+# Without REDIS_URL (or CELERY_BROKER_URL) there is no worker to consume jobs,
+# so they run inline in the submitting process against a memory broker and
+# result store. Tests and local runs need no Redis.
+REDIS_URL = os.getenv('REDIS_URL')
+BROKER_URL = os.getenv('CELERY_BROKER_URL', REDIS_URL)
+RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', REDIS_URL or 'cache+memory://')
+ALWAYS_EAGER = BROKER_URL is None or os.getenv('CELERY_TASK_ALWAYS_EAGER', '0') == '1'
+
+celery_app = Celery('stockgraph', broker=BROKER_URL or 'memory://', backend=RESULT_BACKEND, include=['app.tasks'])
+
+celery_app.conf.update(
+    task_serializer='json',
+    result_serializer='json',
+    accept_content=['json'],
+    # Keep the task name and arguments with the result so status lookups can report them
+    result_extended=True,
+    result_expires=3600,
+    task_track_started=True,
+    task_always_eager=ALWAYS_EAGER,
+    task_store_eager_result=True,
+    # The prefork pool is the process pool for CPU-bound work (graph rebuilds, analytics)
+    worker_concurrency=int(os.getenv('CELERY_WORKER_CONCURRENCY', os.cpu_count() or 2)),
+    worker_prefetch_multiplier=1,
+)
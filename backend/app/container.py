@@ -0,0 +1,126 @@
+import os
+import threading
+import logging
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class Container:
+    """
+    Process-wide service registry. Each service is built on first use, so
+    importing the app does not pull in yfinance/pandas, google.generativeai,
+    torch or scipy until a request actually needs them.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._factories: Dict[str, Callable] = {}
+        self._services: Dict[str, object] = {}
+
+    def register(self, name: str, factory: Callable):
+        self._factories[name] = factory
+
+    def get(self, name: str):
+        service = self._services.get(name)
+        if service is None:
+            with self._lock:
+                service = self._services.get(name)
+                if service is None:
+                    service = self._factories[name]()
+                    self._services[name] = service
+        return service
+
+    def override(self, name: str, service):
+        """Replace a service, e.g. with a fake in tests"""
+        with self._lock:
+            self._services[name] = service
+
+    def reset(self, name: str):
+        """Drop a service (or an override) so it is rebuilt on next use"""
+        with self._lock:
+            self._services.pop(name, None)
+
+    def loaded(self) -> List[str]:
+        return sorted(self._services)
+
+    def preload(self):
+        """
+        Load the read-only data (model weights, price history panel, graph
+        layout and views) in the gunicorn master so forked workers share it
+        copy-on-write.
+        """
+        get_predictor()
+        try:
+            graph_service = get_graph_service()
+            # The layout (a spring layout run) and the views built on it are
+            # the expensive part; compute them once here rather than per worker
+            graph_service.get_layout()
+            graph_service.get_stock_view()
+            graph_service.get_sector_view()
+        except Exception as e:
+            logger.error(f"Error preloading correlation graph: {e}")
+
+
+def _build_store():
+    from .utils.shared_store import MemoryStore, RedisStore
+    redis_url = os.getenv('REDIS_URL')
+    return RedisStore(redis_url) if redis_url else MemoryStore()
+
+
+def _build_fetcher():
+    from .utils.stock_fetcher import StockDataFetcher
+    return StockDataFetcher()
+
+
+def _build_gemini():
+    from .utils.gemini_ai import GeminiAI
+    return GeminiAI()
+
+
+def _build_predictor():
+    from .ml.predictor import StockPredictor
+    return StockPredictor()
+
+
+def _build_graph_service():
+    from .ml.correlation_graph import CorrelationGraphService
+    return CorrelationGraphService(fetcher=get_fetcher(), store=get_store())
+
+
+def _build_analytics():
+    from .ml.graph_analytics import GraphAnalytics
+    return GraphAnalytics(get_graph_service(), store=get_store())
+
+
+container = Container()
+container.register("store", _build_store)
+container.register("fetcher", _build_fetcher)
+container.register("gemini", _build_gemini)
+container.register("predictor", _build_predictor)
+container.register("graph_service", _build_graph_service)
+container.register("analytics", _build_analytics)
+
+
+def get_store():
+    return container.get("store")
+
+
+def get_fetcher():
+    return container.get("fetcher")
+
+
+def get_gemini():
+    return container.get("gemini")
+
+
+def get_predictor():
+    return container.get("predictor")
+
+
+def get_graph_service():
+    return container.get("graph_service")
+
+
+def get_analytics():
+    return container.get("analytics")
@@ -0,0 +1,104 @@
+import hashlib
+import inspect
+import json
+import uuid
+from typing import Dict, Optional
+
+from .container import get_store
+
+# Matches result_expires so a dedup entry never outlives its job
+DEDUP_TTL_SECONDS = 3600
+UNFINISHED_STATES = {"PENDING", "RECEIVED", "STARTED", "RETRY"}
+JOB_TASK_KEY = "stockgraph:job-task:"
+
+
+class UnknownJobError(ValueError):
+    pass
+
+
+class InvalidJobParamsError(ValueError):
+    pass
+
+
+def _async_result(job_id: str):
+    # Celery is imported on first job use rather than at app startup
+    from celery.result import AsyncResult
+    from .celery import celery_app
+    return AsyncResult(job_id, app=celery_app)
+
+
+def job_names():
+    from .tasks import TASKS
+    return sorted(TASKS)
+
+
+def _dedup_key(task_name: str, params: Dict) -> str:
+    payload = json.dumps([task_name, params], sort_keys=True, default=str)
+    return "stockgraph:job:" + hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def submit_job(task_name: str, params: Optional[Dict] = None) -> Dict:
+    """
+    Queue a job, or return the job already pending with the same task and params.
+    Raises UnknownJobError for task names not in TASKS and
+    InvalidJobParamsError when params don't match the task's arguments.
+    """
+    from .tasks import TASKS
+
+    task = TASKS.get(task_name)
+    if task is None:
+        raise UnknownJobError(f"Unknown job {task_name}. Available: {', '.join(sorted(TASKS))}")
+    params = params or {}
+    try:
+        inspect.signature(task.run).bind(**params)
+    except TypeError as e:
+        raise InvalidJobParamsError(f"Invalid params for {task_name}: {e}")
+
+    key = _dedup_key(task_name, params)
+    store = get_store()
+    existing = store.get(key)
+    if existing and _async_result(existing).state in UNFINISHED_STATES:
+        return {"job_id": existing, "task": task_name, "deduplicated": True}
+    if existing:
+        # Only clear the entry if it still points at the finished job
+        store.delete_if_equal(key, existing)
+
+    job_id = str(uuid.uuid4())
+    if not store.set_nx(key, job_id, ex=DEDUP_TTL_SECONDS):
+        # Another request queued the same job first
+        return {"job_id": store.get(key) or job_id, "task": task_name, "deduplicated": True}
+
+    # Celery reports queued-but-unstarted and unknown ids alike as PENDING,
+    # so remember which ids were really submitted
+    store.set(JOB_TASK_KEY + job_id, task_name, ex=DEDUP_TTL_SECONDS)
+
+    try:
+        task.apply_async(kwargs=params, task_id=job_id)
+    except Exception:
+        # Don't leave later identical requests pointing at a job that was never queued
+        store.delete_if_equal(key, job_id)
+        store.delete_if_equal(JOB_TASK_KEY + job_id, task_name)
+        raise
+    return {"job_id": job_id, "task": task_name, "deduplicated": False}
+
+
+def get_job_status(job_id: str) -> Optional[Dict]:
+    """Status of a job, or None if the id was never submitted or has expired"""
+    result = _async_result(job_id)
+    task_name = result.name
+    if task_name is None:
+        # result_extended stores the name once the job starts; before that, check our record
+        task_name = get_store().get(JOB_TASK_KEY + job_id)
+        if task_name is None and result.state == "PENDING":
+            return None
+    status = {
+        "job_id": job_id,
+        "task": task_name,
+        "status": result.state,
+        "ready": result.ready(),
+    }
+    if result.successful():
+        status["result"] = result.result
+    elif result.failed():
+        status["error"] = str(result.result)
+    return status
@@ -1,12 +1,27 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import predictions, websocket, portfolio
+from app.api import predictions, websocket, portfolio, graph, analytics, jobs
+from app.utils.process_pool import shutdown_process_pool
+from app.utils.memory import workers_memory_report
+from app.container import container
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI(title="StockGraph API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Populate the top-movers leaderboard in the background; keep the handle
+    # so the task is neither garbage collected nor left running on shutdown
+    refresh = asyncio.create_task(predictions.refresh_predictions_periodically())
+    yield
+    refresh.cancel()
+    shutdown_process_pool()
+
+app = FastAPI(title="StockGraph API", lifespan=lifespan)
 
 # CORS for frontend
 app.add_middleware(
@@ -19,6 +34,9 @@ app.add_middleware(
 
 app.include_router(predictions.router, prefix="/api")
 app.include_router(portfolio.router, prefix="/api")
+app.include_router(graph.router, prefix="/api")
+app.include_router(analytics.router, prefix="/api")
+app.include_router(jobs.router, prefix="/api")
 app.include_router(websocket.router)
 
 @app.get("/")
@@ -28,3 +46,15 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/memory")
+def memory_check():
+    """
+    Memory of the gunicorn master and each of its workers. `services` lists
+    what the worker serving this request has loaded; the others may differ.
+    """
+    return {
+        **workers_memory_report(),
+        "served_by": os.getpid(),
+        "services": container.loaded(),
+    }
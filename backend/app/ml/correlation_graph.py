@@ -0,0 +1,365 @@
+import json
+import os
+import struct
+import threading
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from ..data.indian_stocks import get_all_stocks
+
+logger = logging.getLogger(__name__)
+
+# Binary payload layout (little endian):
+#   header   magic b'SGRF', format version u16, level u16,
+#            graph version u32, node count u32, edge count u32, label bytes u32
+#   float32  positions[node count * 3]
+#   uint32   edge endpoints[edge count * 2]
+#   float32  weights[edge count]
+#   utf-8    JSON array of node labels (symbol for stocks, sector name for sectors)
+BINARY_MAGIC = b'SGRF'
+BINARY_FORMAT_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sHHIIII')
+LEVEL_STOCKS = 0
+LEVEL_SECTORS = 1
+
+# Used when no price history is available, e.g. offline or rate limited
+FALLBACK_SECTOR_CORRELATION = 0.6
+# Fewer overlapping daily returns than this make every correlation NaN
+MIN_HISTORY_RETURNS = 20
+
+# Shared store keys: the latest graph snapshot and its version, so a rebuild
+# in one process (e.g. the graph.rebuild job) is picked up by every web worker
+GRAPH_VERSION_KEY = "stockgraph:graph:version"
+GRAPH_SNAPSHOT_KEY = "stockgraph:graph:snapshot"
+GRAPH_REBUILD_LOCK_KEY = "stockgraph:graph:rebuild-lock"
+GRAPH_REBUILD_LOCK_SECONDS = 300
+
+
+class CorrelationGraph:
+    """
+    Immutable snapshot of the stock correlation graph. `edges` are the pairs
+    above the threshold, used for layout and communities; `correlations` is
+    the full matrix (NaN where there is too little overlapping history),
+    used for the MST and contagion paths.
+    """
+
+    def __init__(self, version: int, nodes: List[Dict], edges: List[Tuple[int, int, float]],
+                 correlations: np.ndarray):
+        self.version = version
+        self.nodes = nodes
+        self.edges = edges
+        self.correlations = correlations
+        self.graph = nx.Graph()
+        self.graph.add_nodes_from(range(len(nodes)))
+        self.graph.add_weighted_edges_from(edges)
+
+    def sectors(self) -> List[str]:
+        return sorted(set(node['sector'] for node in self.nodes))
+
+
+class CorrelationGraphService:
+    """
+    Builds the correlation graph from daily returns and caches everything
+    derived from it (layout, sector aggregation, encoded payloads) per
+    graph version. With a shared `store`, snapshots are published there and
+    every process serves the newest one.
+    """
+
+    def __init__(self, fetcher, store=None, threshold: float = 0.5, period: str = "6mo",
+                 ttl_seconds: int = 3600):
+        self.fetcher = fetcher
+        self.store = store
+        self.threshold = threshold
+        self.period = period
+        self.ttl_seconds = ttl_seconds
+        # Guards the installed snapshot; held only briefly
+        self._lock = threading.Lock()
+        # Held for a whole rebuild so that one thread per process downloads prices
+        self._build_lock = threading.Lock()
+        self._graph: Optional[CorrelationGraph] = None
+        self._built_at = 0.0
+        self._version = 0
+        self._cache: Dict[tuple, object] = {}
+        # Daily closes behind the last graph this process built, if any
+        self.history = None
+
+    def get_graph(self) -> CorrelationGraph:
+        with self._lock:
+            self._adopt_shared()
+            graph = self._graph
+            stale = graph is not None and time.time() - self._built_at > self.ttl_seconds
+
+        if graph is None:
+            # Nothing to serve yet: the first caller builds, the rest wait for it
+            with self._build_lock:
+                with self._lock:
+                    self._adopt_shared()
+                    graph = self._graph
+                return graph if graph is not None else self._rebuild()
+
+        if stale and self._build_lock.acquire(blocking=False):
+            if self._claim_rebuild():
+                # Keep serving the current graph until the new one is installed
+                threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+            else:
+                # Another process is rebuilding and will publish to the store
+                self._build_lock.release()
+        return graph
+
+    def rebuild(self) -> CorrelationGraph:
+        """Force a rebuild, e.g. after new end-of-day prices"""
+        with self._build_lock:
+            return self._rebuild()
+
+    def _rebuild_in_background(self):
+        try:
+            self._rebuild()
+        except Exception as e:
+            logger.error(f"Error rebuilding correlation graph: {e}")
+        finally:
+            self._build_lock.release()
+
+    def _claim_rebuild(self) -> bool:
+        if self.store is None:
+            return True
+        return self.store.set_nx(GRAPH_REBUILD_LOCK_KEY, os.getpid(), ex=GRAPH_REBUILD_LOCK_SECONDS)
+
+    def _adopt_shared(self):
+        """Switch to the shared snapshot if another process published a newer one"""
+        if self.store is None:
+            return
+        version = self.store.get(GRAPH_VERSION_KEY)
+        if version is None or int(version) == self._version:
+            return
+        raw = self.store.get(GRAPH_SNAPSHOT_KEY)
+        if raw is None:
+            return
+        snapshot = json.loads(raw)
+        if snapshot['version'] == self._version:
+            return
+        edges = [tuple(edge) for edge in snapshot['edges']]
+        # JSON nulls come back as NaN
+        correlations = np.array(snapshot['correlations'], dtype=float)
+        self._install(snapshot['version'], snapshot['nodes'], edges, correlations, snapshot['built_at'])
+
+    def _install(self, version: int, nodes: List[Dict], edges: List[Tuple[int, int, float]],
+                 correlations: np.ndarray, built_at: float):
+        self._version = version
+        self._graph = CorrelationGraph(version, nodes, edges, correlations)
+        self._built_at = built_at
+        # Everything cached belongs to the previous version
+        self._cache.clear()
+
+    def _rebuild(self) -> CorrelationGraph:
+        """Build a new snapshot without holding `_lock`, then install it"""
+        stocks = get_all_stocks()
+        nodes = [
+            {"id": i, "symbol": symbol, "name": name, "sector": sector}
+            for i, (symbol, name, sector) in enumerate(stocks)
+        ]
+        correlations = self._correlation_matrix([s[0] for s in stocks])
+        edges = self._threshold_edges(correlations) if correlations is not None else None
+        if edges is None:
+            logger.warning("Falling back to sector-based correlation graph")
+            correlations = self._sector_correlations(nodes)
+            edges = self._sector_edges(nodes)
+
+        built_at = time.time()
+        if self.store is None:
+            with self._lock:
+                self._install(self._version + 1, nodes, edges, correlations, built_at)
+                return self._graph
+
+        try:
+            version = self.store.incr(GRAPH_VERSION_KEY)
+            self.store.set(GRAPH_SNAPSHOT_KEY, json.dumps({
+                "version": version, "built_at": built_at, "nodes": nodes, "edges": edges,
+                "correlations": np.where(np.isnan(correlations), None, correlations.round(4)).tolist()
+            }))
+        finally:
+            self.store.delete_if_equal(GRAPH_REBUILD_LOCK_KEY, os.getpid())
+        with self._lock:
+            # A newer snapshot may have been adopted while this one was building
+            if version > self._version:
+                self._install(version, nodes, edges, correlations, built_at)
+            return self._graph
+
+    def _correlation_matrix(self, symbols: List[str]) -> Optional[np.ndarray]:
+        closes = self.fetcher.get_close_history(symbols, period=self.period)
+        self.history = closes
+        # One more close than returns is needed
+        if closes is None or len(closes) <= MIN_HISTORY_RETURNS:
+            return None
+
+        returns = closes.reindex(columns=symbols).pct_change(fill_method=None)
+        return returns.corr(min_periods=MIN_HISTORY_RETURNS).to_numpy()
+
+    def _threshold_edges(self, correlations: np.ndarray) -> Optional[List[Tuple[int, int, float]]]:
+        i, j = np.triu_indices(len(correlations), k=1)
+        weights = correlations[i, j]
+        # Only positive co-movement links; NaN compares False and is dropped
+        keep = weights >= self.threshold
+        if not keep.any():
+            return None
+        return [
+            (int(a), int(b), round(float(w), 4))
+            for a, b, w in zip(i[keep], j[keep], weights[keep])
+        ]
+
+    def _sector_correlations(self, nodes: List[Dict]) -> np.ndarray:
+        sectors = np.array([node['sector'] for node in nodes])
+        correlations = np.where(sectors[:, None] == sectors[None, :], FALLBACK_SECTOR_CORRELATION, 0.0)
+        np.fill_diagonal(correlations, 1.0)
+        return correlations
+
+    def _sector_edges(self, nodes: List[Dict]) -> List[Tuple[int, int, float]]:
+        edges = []
+        for a in nodes:
+            for b in nodes[a['id'] + 1:]:
+                if a['sector'] == b['sector']:
+                    edges.append((a['id'], b['id'], FALLBACK_SECTOR_CORRELATION))
+        return edges
+
+    def _cached(self, key: tuple, build):
+        graph = self.get_graph()
+        cache_key = (graph.version,) + key
+        value = self._cache.get(cache_key)
+        if value is None:
+            value = build(graph)
+            # Skip storing if a rebuild landed while we were computing
+            if graph.version == self._version:
+                self._cache[cache_key] = value
+        return value
+
+    # --- Layout ---
+
+    def get_layout(self) -> np.ndarray:
+        """3D force-directed coordinates, shape (node count, 3)"""
+        return self._cached(("layout",), self._compute_layout)
+
+    def _compute_layout(self, graph: CorrelationGraph) -> np.ndarray:
+        n = len(graph.nodes)
+        if n == 0:
+            return np.zeros((0, 3), dtype=np.float32)
+        pos = nx.spring_layout(graph.graph, dim=3, weight='weight', seed=42, scale=100)
+        return np.array([pos[i] for i in range(n)], dtype=np.float32)
+
+    # --- Level of detail ---
+
+    def get_stock_view(self) -> Dict:
+        """Full resolution graph with precomputed positions"""
+        return self._cached(("stocks",), self._build_stock_view)
+
+    def _build_stock_view(self, graph: CorrelationGraph) -> Dict:
+        layout = self.get_layout()
+        nodes = [
+            {**node, "x": float(x), "y": float(y), "z": float(z)}
+            for node, (x, y, z) in zip(graph.nodes, layout)
+        ]
+        links = [{"source": a, "target": b, "correlation": w} for a, b, w in graph.edges]
+        return {"version": graph.version, "level": "stocks", "nodes": nodes, "links": links}
+
+    def get_sector_view(self) -> Dict:
+        """One node per sector, placed at its members' centroid"""
+        return self._cached(("sectors",), self._build_sector_view)
+
+    def _build_sector_view(self, graph: CorrelationGraph) -> Dict:
+        layout = self.get_layout()
+        sectors = graph.sectors()
+        sector_index = {sector: i for i, sector in enumerate(sectors)}
+        members: Dict[str, List[int]] = {sector: [] for sector in sectors}
+        for node in graph.nodes:
+            members[node['sector']].append(node['id'])
+
+        nodes = []
+        for i, sector in enumerate(sectors):
+            x, y, z = layout[members[sector]].mean(axis=0)
+            nodes.append({
+                "id": i,
+                "sector": sector,
+                "size": len(members[sector]),
+                "x": float(x), "y": float(y), "z": float(z)
+            })
+
+        links = [
+            {"source": sector_index[a], "target": sector_index[b], "correlation": w, "count": count}
+            for (a, b), (w, count) in self._cross_sector_links(graph).items()
+        ]
+        return {"version": graph.version, "level": "sectors", "nodes": nodes, "links": links}
+
+    def _cross_sector_links(self, graph: CorrelationGraph, only: Optional[List[int]] = None) -> Dict:
+        """Mean correlation between sectors; with `only`, links from those stocks to other sectors"""
+        totals: Dict[tuple, List[float]] = {}
+        only_set = set(only) if only is not None else None
+        for a, b, w in graph.edges:
+            sa, sb = graph.nodes[a]['sector'], graph.nodes[b]['sector']
+            if sa == sb:
+                continue
+            if only_set is None:
+                key = tuple(sorted((sa, sb)))
+            elif a in only_set:
+                key = (a, sb)
+            elif b in only_set:
+                key = (b, sa)
+            else:
+                continue
+            totals.setdefault(key, []).append(w)
+        return {key: (round(sum(ws) / len(ws), 4), len(ws)) for key, ws in totals.items()}
+
+    def expand_sector(self, sector: str) -> Optional[Dict]:
+        """Member stocks of one sector plus their links out to the other sector nodes"""
+        graph = self.get_graph()
+        if sector not in graph.sectors():
+            return None
+        return self._cached(("expand", sector), lambda g: self._build_expansion(g, sector))
+
+    def _build_expansion(self, graph: CorrelationGraph, sector: str) -> Dict:
+        view = self.get_stock_view()
+        member_ids = [node['id'] for node in graph.nodes if node['sector'] == sector]
+        members = set(member_ids)
+        nodes = [view['nodes'][i] for i in member_ids]
+        links = [
+            link for link in view['links']
+            if link['source'] in members and link['target'] in members
+        ]
+        external = [
+            {"source": stock_id, "target_sector": other, "correlation": w, "count": count}
+            for (stock_id, other), (w, count) in self._cross_sector_links(graph, only=member_ids).items()
+        ]
+        return {
+            "version": graph.version,
+            "level": "sector",
+            "sector": sector,
+            "nodes": nodes,
+            "links": links,
+            "external_links": external
+        }
+
+    # --- Binary encoding ---
+
+    def get_binary(self, level: str = "stocks") -> bytes:
+        return self._cached(("binary", level), lambda g: self._encode_binary(g, level))
+
+    def _encode_binary(self, graph: CorrelationGraph, level: str) -> bytes:
+        view = self.get_sector_view() if level == "sectors" else self.get_stock_view()
+        labels_key = "sector" if level == "sectors" else "symbol"
+
+        positions = np.array([[n['x'], n['y'], n['z']] for n in view['nodes']], dtype='<f4').reshape(-1, 3)
+        endpoints = np.array([[l['source'], l['target']] for l in view['links']], dtype='<u4').reshape(-1, 2)
+        weights = np.array([l['correlation'] for l in view['links']], dtype='<f4')
+        labels = json.dumps([n[labels_key] for n in view['nodes']]).encode('utf-8')
+
+        header = BINARY_HEADER.pack(
+            BINARY_MAGIC,
+            BINARY_FORMAT_VERSION,
+            LEVEL_SECTORS if level == "sectors" else LEVEL_STOCKS,
+            graph.version,
+            len(positions),
+            len(weights),
+            len(labels)
+        )
+        return header + positions.tobytes() + endpoints.tobytes() + weights.tobytes() + labels
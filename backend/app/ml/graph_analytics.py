@@ -0,0 +1,257 @@
+import asyncio
+import json
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+from scipy.sparse.linalg import eigsh
+
+from .correlation_graph import CorrelationGraph, CorrelationGraphService
+from ..utils.process_pool import get_process_pool
+
+Edge = Tuple[int, int, float]
+
+
+# --- Pure functions, run inside the process pool ---
+# They take plain lists and arrays so arguments pickle cheaply.
+
+def _adjacency(n: int, edges: List[Edge]) -> sparse.csr_matrix:
+    if not edges:
+        return sparse.csr_matrix((n, n))
+    rows, cols, weights = zip(*edges)
+    upper = sparse.coo_matrix((weights, (rows, cols)), shape=(n, n))
+    return (upper + upper.T).tocsr()
+
+
+def correlation_distance(correlation):
+    """Mantegna distance sqrt(2 * (1 - rho)), a metric on correlations"""
+    return np.sqrt(np.clip(2.0 * (1.0 - np.asarray(correlation, dtype=float)), 0.0, None))
+
+
+def _distance_matrix(n: int, edges: List[Edge]) -> sparse.csr_matrix:
+    # csgraph treats stored zeros as missing edges, so keep rho == 1 reachable
+    return _adjacency(n, [(a, b, max(float(correlation_distance(w)), 1e-9)) for a, b, w in edges])
+
+
+def compute_centrality(n: int, edges: List[Edge]) -> Dict[str, List[float]]:
+    adjacency = _adjacency(n, edges)
+
+    if n > 2 and adjacency.nnz:
+        _, vectors = eigsh(adjacency.astype(float), k=1, which='LA')
+        eigenvector = np.abs(vectors[:, 0])
+    elif n:
+        _, vectors = np.linalg.eigh(adjacency.toarray())
+        eigenvector = np.abs(vectors[:, -1])
+    else:
+        eigenvector = np.zeros(0)
+    norm = np.linalg.norm(eigenvector)
+    if norm:
+        eigenvector = eigenvector / norm
+
+    graph = nx.Graph()
+    graph.add_nodes_from(range(n))
+    graph.add_weighted_edges_from(edges)
+    # networkx computes PageRank on a scipy sparse matrix
+    pagerank = nx.pagerank(graph, weight='weight')
+
+    return {
+        "eigenvector": [round(float(v), 6) for v in eigenvector],
+        "pagerank": [round(float(pagerank[i]), 6) for i in range(n)],
+        "degree": [int(d) for d in np.diff(adjacency.indptr)],
+    }
+
+
+def adjusted_rand_index(labels_a: List, labels_b: List) -> float:
+    """Agreement between two partitions, 1.0 identical and ~0.0 for chance"""
+    _, a = np.unique(labels_a, return_inverse=True)
+    _, b = np.unique(labels_b, return_inverse=True)
+    contingency = sparse.coo_matrix((np.ones(len(a)), (a, b))).toarray()
+
+    def pairs(x):
+        return float((x * (x - 1) / 2).sum())
+
+    index = pairs(contingency)
+    sum_a = pairs(contingency.sum(axis=1))
+    sum_b = pairs(contingency.sum(axis=0))
+    total = pairs(np.array([len(a)]))
+    if total == 0:
+        return 1.0
+    expected = sum_a * sum_b / total
+    maximum = (sum_a + sum_b) / 2
+    if maximum == expected:
+        return 1.0
+    return (index - expected) / (maximum - expected)
+
+
+def compute_communities(n: int, edges: List[Edge], sectors: List[str]) -> Dict:
+    graph = nx.Graph()
+    graph.add_nodes_from(range(n))
+    graph.add_weighted_edges_from(edges)
+    communities = nx.community.louvain_communities(graph, weight='weight', seed=42)
+    communities = sorted((sorted(c) for c in communities), key=len, reverse=True)
+
+    labels = [0] * n
+    summary = []
+    for label, members in enumerate(communities):
+        counts: Dict[str, int] = {}
+        for node in members:
+            labels[node] = label
+            counts[sectors[node]] = counts.get(sectors[node], 0) + 1
+        dominant = max(counts, key=counts.get)
+        summary.append({
+            "id": label,
+            "members": members,
+            "dominant_sector": dominant,
+            "purity": round(counts[dominant] / len(members), 4),
+            "sector_counts": counts,
+        })
+
+    # Modularity divides by the total edge weight, so it is undefined without edges
+    modularity = 0.0
+    if graph.number_of_edges():
+        modularity = round(nx.community.modularity(graph, communities, weight='weight'), 4)
+
+    return {
+        "communities": summary,
+        "modularity": modularity,
+        "sector_agreement": round(adjusted_rand_index(labels, sectors), 4),
+    }
+
+
+def compute_mst(correlations) -> List[Edge]:
+    """
+    Minimum spanning tree over the correlation distance of every pair, not
+    just the pairs above the graph threshold, returned as correlation edges.
+    Pairs with unknown correlation (NaN) are left out.
+    """
+    correlations = np.asarray(correlations, dtype=float)
+    # csgraph treats zeros as missing edges, so keep rho == 1 reachable
+    distances = np.maximum(correlation_distance(correlations), 1e-9)
+    distances[np.isnan(distances)] = 0.0
+    np.fill_diagonal(distances, 0.0)
+    tree = csgraph.minimum_spanning_tree(distances).tocoo()
+    return [
+        (int(min(a, b)), int(max(a, b)), round(float(correlations[a, b]), 4))
+        for a, b in zip(tree.row, tree.col)
+    ]
+
+
+def analyses(graph: CorrelationGraph) -> Dict[str, tuple]:
+    """Function and pool-friendly arguments behind each cached analysis of `graph`"""
+    n = len(graph.nodes)
+    return {
+        "centrality": (compute_centrality, n, graph.edges),
+        "communities": (compute_communities, n, graph.edges, [node['sector'] for node in graph.nodes]),
+        "mst": (compute_mst, graph.correlations),
+    }
+
+
+# Shared store keys for results, per graph version, so the graph.rebuild job
+# and every web worker compute each analysis once between them
+ANALYTICS_KEY = "stockgraph:analytics:"
+ANALYTICS_TTL_SECONDS = 24 * 3600
+
+
+def _analytics_key(version: int, name: str) -> str:
+    return f"{ANALYTICS_KEY}{version}:{name}"
+
+
+def publish_analytics(store, graph: CorrelationGraph) -> Dict[str, object]:
+    """Run every analysis inline and publish the results for the web workers"""
+    results = {}
+    for name, (func, *args) in analyses(graph).items():
+        results[name] = func(*args)
+        store.set(_analytics_key(graph.version, name), json.dumps(results[name]), ex=ANALYTICS_TTL_SECONDS)
+    return results
+
+
+# --- Cached, async front end ---
+
+class GraphAnalytics:
+    """
+    Analytics over the correlation graph. Results are cached per graph
+    version; concurrent requests for the same result share one computation.
+    With a shared `store`, results published by another process (e.g. the
+    graph.rebuild job) are used instead of computing them again.
+    """
+
+    def __init__(self, service: CorrelationGraphService, store=None):
+        self.service = service
+        self.store = store
+        self._lock = threading.Lock()
+        self._cache: Dict[tuple, asyncio.Future] = {}
+        self._distances: Dict[int, sparse.csr_matrix] = {}
+
+    async def get_graph(self) -> CorrelationGraph:
+        # Building the graph may download prices; keep it off the event loop
+        return await asyncio.to_thread(self.service.get_graph)
+
+    async def _run(self, graph: CorrelationGraph, name: str):
+        key = (graph.version, name)
+        with self._lock:
+            future = self._cache.get(key)
+            if future is None:
+                # Drop results from older graph versions
+                self._cache = {k: v for k, v in self._cache.items() if k[0] == graph.version}
+                future = asyncio.ensure_future(self._compute(graph, name))
+                self._cache[key] = future
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            with self._lock:
+                if self._cache.get(key) is future:
+                    del self._cache[key]
+            raise
+
+    async def _compute(self, graph: CorrelationGraph, name: str):
+        store_key = _analytics_key(graph.version, name)
+        if self.store is not None:
+            raw = await asyncio.to_thread(self.store.get, store_key)
+            if raw is not None:
+                return json.loads(raw)
+
+        func, *args = analyses(graph)[name]
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(get_process_pool(), func, *args)
+        if self.store is not None:
+            await asyncio.to_thread(self.store.set, store_key, json.dumps(result), ANALYTICS_TTL_SECONDS)
+        return result
+
+    async def centrality(self) -> Tuple[CorrelationGraph, Dict]:
+        graph = await self.get_graph()
+        return graph, await self._run(graph, "centrality")
+
+    async def communities(self) -> Tuple[CorrelationGraph, Dict]:
+        graph = await self.get_graph()
+        return graph, await self._run(graph, "communities")
+
+    async def mst(self) -> Tuple[CorrelationGraph, List[Edge]]:
+        graph = await self.get_graph()
+        return graph, await self._run(graph, "mst")
+
+    def contagion_path(self, graph: CorrelationGraph, source: int, target: int) -> Optional[Dict]:
+        """
+        Path through the MST, i.e. the chain of strongest co-movements linking
+        two stocks. Correlation distance is a metric, so a shortest path over
+        every pair would always be the direct edge; the tree path instead
+        minimises the largest hop. Building the tree and one Dijkstra run are
+        cheap, so they run inline rather than in the pool.
+        """
+        with self._lock:
+            distances = self._distances.get(graph.version)
+            if distances is None:
+                distances = _distance_matrix(len(graph.nodes), compute_mst(graph.correlations))
+                self._distances = {graph.version: distances}
+
+        dist, predecessors = csgraph.dijkstra(distances, indices=source, return_predecessors=True)
+        if not np.isfinite(dist[target]):
+            return None
+
+        path = [target]
+        while path[-1] != source:
+            path.append(int(predecessors[path[-1]]))
+        path.reverse()
+        return {"path": path, "distance": round(float(dist[target]), 4)}
@@ -0,0 +1,176 @@
+import bisect
+import json
+import threading
+from typing import Dict, List, Optional
+
+
+class _RankedIndex:
+    """Sorted (key, ticker) pairs supporting in-place re-ranking of a single ticker"""
+
+    def __init__(self):
+        self._entries = []
+        self._keys = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def upsert(self, ticker: str, key: float):
+        self.remove(ticker)
+        bisect.insort(self._entries, (key, ticker))
+        self._keys[ticker] = key
+
+    def remove(self, ticker: str):
+        key = self._keys.pop(ticker, None)
+        if key is None:
+            return
+        i = bisect.bisect_left(self._entries, (key, ticker))
+        if i < len(self._entries) and self._entries[i] == (key, ticker):
+            del self._entries[i]
+
+    def head(self, k: int) -> List[str]:
+        """Tickers with the k smallest keys, smallest first"""
+        return [ticker for _, ticker in self._entries[:k]]
+
+    def tail(self, k: int) -> List[str]:
+        """Tickers with the k largest keys, largest first"""
+        if k <= 0:
+            return []
+        return [ticker for _, ticker in reversed(self._entries[-k:])]
+
+
+class PredictionLeaderboard:
+    """
+    Materialized ranking of the latest per-ticker predictions.
+
+    Every call to `update` re-ranks a single ticker in the global and
+    per-sector indexes, so reads only slice the first k entries and never
+    re-sort the universe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._predictions: Dict[str, Dict] = {}
+        # Keyed by sector; None holds the whole universe
+        self._by_move: Dict[Optional[str], _RankedIndex] = {}
+        self._by_change: Dict[Optional[str], _RankedIndex] = {}
+
+    def __len__(self):
+        return len(self._predictions)
+
+    def update(self, prediction: Dict):
+        """Insert or replace the prediction for `prediction['ticker']`"""
+        ticker = prediction['ticker']
+        sector = prediction.get('sector')
+        change = float(prediction['predicted_change'])
+
+        with self._lock:
+            previous = self._predictions.get(ticker)
+            if previous is not None and previous.get('sector') != sector:
+                self._drop_from_sector(ticker, previous.get('sector'))
+
+            self._predictions[ticker] = prediction
+            for scope in (None, sector):
+                # Negated so the biggest absolute move sorts first
+                self._by_move.setdefault(scope, _RankedIndex()).upsert(ticker, -abs(change))
+                self._by_change.setdefault(scope, _RankedIndex()).upsert(ticker, change)
+
+    def remove(self, ticker: str):
+        with self._lock:
+            previous = self._predictions.pop(ticker, None)
+            if previous is None:
+                return
+            self._drop_from_sector(ticker, None)
+            self._drop_from_sector(ticker, previous.get('sector'))
+
+    def _drop_from_sector(self, ticker: str, sector: Optional[str]):
+        for indexes in (self._by_move, self._by_change):
+            if sector in indexes:
+                indexes[sector].remove(ticker)
+
+    def get(self, ticker: str) -> Optional[Dict]:
+        return self._predictions.get(ticker)
+
+    def top_movers(self, k: int = 10, sector: Optional[str] = None) -> List[Dict]:
+        """Biggest predicted moves in either direction"""
+        with self._lock:
+            index = self._by_move.get(sector)
+            if index is None:
+                return []
+            return [self._predictions[t] for t in index.head(k)]
+
+    def top_gainers(self, k: int = 10, sector: Optional[str] = None) -> List[Dict]:
+        """Largest predicted rises, excluding flat or falling tickers"""
+        with self._lock:
+            index = self._by_change.get(sector)
+            if index is None:
+                return []
+            ranked = [self._predictions[t] for t in index.tail(k)]
+        return [p for p in ranked if p['predicted_change'] > 0]
+
+    def top_losers(self, k: int = 10, sector: Optional[str] = None) -> List[Dict]:
+        """Largest predicted falls, excluding flat or rising tickers"""
+        with self._lock:
+            index = self._by_change.get(sector)
+            if index is None:
+                return []
+            ranked = [self._predictions[t] for t in index.head(k)]
+        return [p for p in ranked if p['predicted_change'] < 0]
+
+
+# Shared store keys: every prediction by ticker, plus a counter bumped on
+# each write so readers can tell cheaply whether anything changed
+PREDICTIONS_KEY = "stockgraph:predictions"
+PREDICTIONS_VERSION_KEY = "stockgraph:predictions:version"
+
+# This process's view of the shared predictions
+leaderboard = PredictionLeaderboard()
+_synced_version = None
+_sync_lock = threading.Lock()
+
+
+def publish_predictions(predictions: List[Dict]):
+    """
+    Record predictions where every web and job worker can see them. The
+    version is bumped once per call, so a whole sweep costs readers a single
+    resync rather than one per ticker.
+    """
+    global _synced_version
+    from ..container import get_store
+
+    if not predictions:
+        return
+    store = get_store()
+    store.hset_many(PREDICTIONS_KEY, {p['ticker']: json.dumps(p) for p in predictions})
+    with _sync_lock:
+        version = store.incr(PREDICTIONS_VERSION_KEY)
+        for prediction in predictions:
+            leaderboard.update(prediction)
+        # Our own write needs no resync, unless another process wrote since our last sync
+        if _synced_version == str(version - 1):
+            _synced_version = str(version)
+
+
+def publish_prediction(prediction: Dict):
+    publish_predictions([prediction])
+
+
+def sync_leaderboard() -> PredictionLeaderboard:
+    """
+    Bring the local leaderboard up to date with the shared store. Costs one
+    key lookup when nothing changed; otherwise re-ranks only changed tickers.
+    """
+    global _synced_version
+    from ..container import get_store
+
+    store = get_store()
+    version = store.get(PREDICTIONS_VERSION_KEY)
+    if version == _synced_version:
+        return leaderboard
+    with _sync_lock:
+        if version != _synced_version:
+            for raw in store.hgetall(PREDICTIONS_KEY).values():
+                prediction = json.loads(raw)
+                if leaderboard.get(prediction['ticker']) != prediction:
+                    leaderboard.update(prediction)
+            _synced_version = version
+    return leaderboard
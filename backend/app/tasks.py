@@ -0,0 +1,88 @@
+from typing import Dict, List, Optional
+
+from .celery import celery_app
+from .api.predictions import refresh_all_predictions, get_explanation
+from .api.portfolio import Holding, analyze_holdings
+from .container import get_graph_service, get_store
+from .ml.leaderboard import sync_leaderboard
+
+
+@celery_app.task(name="predictions.refresh")
+def refresh_predictions() -> List[Dict]:
+    """Re-predict the whole universe into the shared store; returns biggest absolute moves first"""
+    predictions = refresh_all_predictions()
+    predictions.sort(key=lambda p: abs(p['predicted_change']), reverse=True)
+    return predictions
+
+
+@celery_app.task(name="graph.rebuild")
+def rebuild_graph() -> Dict:
+    """
+    Rebuild and publish the correlation graph for the web workers, then run
+    the heavy analytics on it and publish those too, so web workers serve
+    them without recomputing
+    """
+    # scipy/networkx are only needed by workers that actually run this task
+    from .ml.graph_analytics import publish_analytics
+
+    graph_service = get_graph_service()
+    graph = graph_service.rebuild()
+    graph_service.get_layout()
+    results = publish_analytics(get_store(), graph)
+
+    n = len(graph.nodes)
+    communities = results['communities']
+    pagerank = results['centrality']['pagerank']
+    most_central = max(range(n), key=lambda i: pagerank[i]) if n else None
+    return {
+        "version": graph.version,
+        "nodes": n,
+        "edges": len(graph.edges),
+        "mst_edges": len(results['mst']),
+        "communities": len(communities['communities']),
+        "modularity": communities['modularity'],
+        "sector_agreement": communities['sector_agreement'],
+        "most_central": graph.nodes[most_central]['symbol'] if most_central is not None else None,
+    }
+
+
+@celery_app.task(name="portfolio.analyze_batch")
+def analyze_portfolio_batch(portfolios: List[List[Dict]]) -> List[Dict]:
+    """Analyze many portfolios; each portfolio is a list of holdings"""
+    results = []
+    for holdings in portfolios:
+        if not holdings:
+            results.append(None)
+            continue
+        analysis = analyze_holdings([Holding(**holding) for holding in holdings])
+        results.append(analysis.model_dump())
+    return results
+
+
+@celery_app.task(name="explanations.prefetch")
+def prefetch_explanations(tickers: Optional[List[str]] = None, limit: int = 10) -> Dict[str, str]:
+    """
+    Generate Gemini explanations ahead of time into the shared cache that
+    /predict reads. Defaults to the current shared top movers. Predictions
+    are always looked up here, never taken from the caller, so a job cannot
+    plant an explanation for made-up prices.
+    """
+    leaderboard = sync_leaderboard()
+    if tickers is None:
+        predictions = leaderboard.top_movers(limit) or refresh_predictions()[:limit]
+    else:
+        predictions = [leaderboard.get(ticker.replace(".NS", "")) for ticker in tickers]
+
+    return {
+        prediction['ticker']: get_explanation(prediction)
+        for prediction in predictions if prediction is not None
+    }
+
+
+# Public job names accepted by the jobs API
+TASKS = {
+    "predictions.refresh": refresh_predictions,
+    "graph.rebuild": rebuild_graph,
+    "portfolio.analyze_batch": analyze_portfolio_batch,
+    "explanations.prefetch": prefetch_explanations,
+}
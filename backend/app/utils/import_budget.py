@@ -0,0 +1,84 @@
+"""
+Import-time budget check for the API entry point.
+
+    python -m app.utils.import_budget --budget 1.0
+
+Imports the module in a fresh interpreter with -X importtime and fails if it
+takes longer than the budget or eagerly imports any of the heavy packages
+that the service container is meant to load on demand.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+DEFAULT_MODULE = "app.main"
+DEFAULT_BUDGET_SECONDS = 1.0
+HEAVY_MODULES = [
+    "yfinance",
+    "pandas",
+    "google.generativeai",
+    "torch",
+    "torch_geometric",
+    "scipy",
+    "networkx",
+]
+
+
+def measure_import(module: str = DEFAULT_MODULE) -> Dict:
+    """Import `module` in a subprocess; returns total seconds and top-level packages imported"""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=backend_dir
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+
+    total_us = 0
+    imported = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        name = name.strip()
+        imported.add(name)
+        # The entry for the module itself includes everything it pulled in
+        if name == module:
+            total_us = int(cumulative)
+
+    return {"module": module, "seconds": total_us / 1e6, "imported": imported}
+
+
+def heavy_imports(imported) -> List[str]:
+    return [m for m in HEAVY_MODULES if m in imported]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--budget", type=float,
+                        default=float(os.getenv("IMPORT_BUDGET_SECONDS", DEFAULT_BUDGET_SECONDS)))
+    args = parser.parse_args(argv)
+
+    report = measure_import(args.module)
+    eager = heavy_imports(report["imported"])
+    print(f"import {report['module']}: {report['seconds']:.3f}s (budget {args.budget:.3f}s)")
+
+    failed = False
+    if report["seconds"] > args.budget:
+        print("FAIL: over import-time budget")
+        failed = True
+    if eager:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(eager)}")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import os
+from typing import Dict, List, Optional, Union
+
+Pid = Union[int, str]
+
+
+def _proc_kb(pid: Pid, filename: str) -> Dict[str, int]:
+    """kB values from /proc/<pid>/status or /proc/<pid>/smaps_rollup (Linux only)"""
+    values = {}
+    try:
+        with open(f"/proc/{pid}/{filename}") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    values[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        pass
+    return values
+
+
+def memory_report(pid: Pid = "self") -> Dict:
+    """
+    Memory of one process in MB. `private_mb` is what the process costs on
+    its own; `shared_mb` is still shared copy-on-write with the preloading
+    master and the other workers.
+    """
+    status = _proc_kb(pid, "status")
+    smaps = _proc_kb(pid, "smaps_rollup")
+    report = {"pid": os.getpid() if pid == "self" else int(pid)}
+    if "VmHWM" in status:
+        report["peak_rss_mb"] = round(status["VmHWM"] / 1024, 1)
+    if smaps:
+        private = smaps.get("Private_Clean", 0) + smaps.get("Private_Dirty", 0)
+        shared = smaps.get("Shared_Clean", 0) + smaps.get("Shared_Dirty", 0)
+        report.update({
+            "rss_mb": round(smaps.get("Rss", 0) / 1024, 1),
+            "pss_mb": round(smaps.get("Pss", 0) / 1024, 1),
+            "private_mb": round(private / 1024, 1),
+            "shared_mb": round(shared / 1024, 1),
+        })
+    elif "VmRSS" in status:
+        report["rss_mb"] = round(status["VmRSS"] / 1024, 1)
+    return report
+
+
+def child_pids(parent: Pid) -> List[int]:
+    """Direct children of a process, e.g. the gunicorn master's workers"""
+    try:
+        with open(f"/proc/{parent}/task/{parent}/children") as f:
+            return sorted(int(pid) for pid in f.read().split())
+    except OSError:
+        pass
+    # Kernels without CONFIG_PROC_CHILDREN: scan every process's parent
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; ppid follows the closing paren
+                ppid = f.read().rsplit(")", 1)[1].split()[1]
+        except (OSError, IndexError):
+            continue
+        if ppid == str(parent):
+            children.append(int(entry))
+    return sorted(children)
+
+
+def workers_memory_report(master_pid: Optional[Pid] = None) -> Dict:
+    """
+    Memory of the gunicorn master and every worker it has forked. Each
+    worker's `pool` lists its own children, i.e. the spawned CPU pool
+    processes, which share nothing with the master.
+    """
+    if master_pid is None:
+        master_pid = os.getenv("GUNICORN_MASTER_PID")
+    if master_pid is None:
+        # Not under gunicorn: a single process serves everything
+        return {"master": None, "workers": [_with_pool(os.getpid())]}
+    return {
+        "master": memory_report(master_pid),
+        "workers": [_with_pool(pid) for pid in child_pids(master_pid)],
+    }
+
+
+def _with_pool(pid: int) -> Dict:
+    return {**memory_report(pid), "pool": [memory_report(child) for child in child_pids(pid)]}
@@ -0,0 +1,29 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Process pool for CPU-bound work, created on first use so that forked
+    server workers each get their own pool instead of inheriting one.
+    Spawned processes import numpy/scipy/networkx afresh and share nothing
+    copy-on-write, so each costs its full size: budget web workers times
+    CPU_POOL_WORKERS of them (see /health/memory).
+    """
+    global _pool
+    if _pool is None:
+        workers = int(os.getenv('CPU_POOL_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+        # spawn avoids forking a process that already runs an event loop and threads
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    return _pool
+
+
+def shutdown_process_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
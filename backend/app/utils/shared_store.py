@@ -0,0 +1,115 @@
+import threading
+import time
+from typing import Dict, Optional
+
+
+class MemoryStore:
+    """
+    In-process stand-in for Redis, used when REDIS_URL is not set. State is
+    only shared within one process, which is enough for tests, eager Celery
+    and a single web worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, str] = {}
+        self._expires: Dict[str, float] = {}
+        self._hashes: Dict[str, Dict[str, str]] = {}
+
+    def _expire(self, key: str):
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.time():
+            self._values.pop(key, None)
+            self._expires.pop(key, None)
+
+    def _store(self, key: str, value, ex: Optional[int]):
+        self._values[key] = str(value)
+        if ex:
+            self._expires[key] = time.time() + ex
+        else:
+            self._expires.pop(key, None)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            self._expire(key)
+            return self._values.get(key)
+
+    def set(self, key: str, value, ex: Optional[int] = None):
+        with self._lock:
+            self._store(key, value, ex)
+
+    def set_nx(self, key: str, value, ex: Optional[int] = None) -> bool:
+        """Set only if the key is absent; True if this call set it"""
+        with self._lock:
+            self._expire(key)
+            if key in self._values:
+                return False
+            self._store(key, value, ex)
+            return True
+
+    def delete_if_equal(self, key: str, value):
+        with self._lock:
+            if self._values.get(key) == str(value):
+                self._values.pop(key, None)
+                self._expires.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._expire(key)
+            value = int(self._values.get(key, 0)) + 1
+            self._values[key] = str(value)
+            return value
+
+    def hset(self, name: str, field: str, value):
+        with self._lock:
+            self._hashes.setdefault(name, {})[field] = str(value)
+
+    def hset_many(self, name: str, mapping: Dict[str, str]):
+        with self._lock:
+            self._hashes.setdefault(name, {}).update((field, str(value)) for field, value in mapping.items())
+
+    def hgetall(self, name: str) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._hashes.get(name, {}))
+
+
+class RedisStore:
+    """Same interface backed by Redis, shared by every web and Celery worker"""
+
+    def __init__(self, url: str):
+        import redis
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._redis.get(key)
+
+    def set(self, key: str, value, ex: Optional[int] = None):
+        self._redis.set(key, value, ex=ex)
+
+    def set_nx(self, key: str, value, ex: Optional[int] = None) -> bool:
+        return bool(self._redis.set(key, value, nx=True, ex=ex))
+
+    def delete_if_equal(self, key: str, value):
+        with self._redis.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                if pipe.get(key) == str(value):
+                    pipe.multi()
+                    pipe.delete(key)
+                    pipe.execute()
+            except Exception:
+                # Someone else changed the key first; leave theirs in place
+                pass
+
+    def incr(self, key: str) -> int:
+        return int(self._redis.incr(key))
+
+    def hset(self, name: str, field: str, value):
+        self._redis.hset(name, field, value)
+
+    def hset_many(self, name: str, mapping: Dict[str, str]):
+        if mapping:
+            self._redis.hset(name, mapping=mapping)
+
+    def hgetall(self, name: str) -> Dict[str, str]:
+        return self._redis.hgetall(name)
@@ -52,6 +52,44 @@ class StockDataFetcher:
             logger.error(f"Error fetching data for {symbol}: {e}")
             return None
     
+    def get_stock_prices(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Latest close and daily change for many symbols in one batched download
+        Returns: {symbol: {'symbol', 'current_price', 'change', 'change_percent', 'volume'}}
+        Symbols without two recent closes are left out.
+        """
+        try:
+            hist = yf.download(symbols, period="5d", progress=False, threads=True)
+            if hist.empty:
+                logger.warning("No recent prices available")
+                return {}
+            closes, volumes = hist['Close'], hist['Volume']
+            # A single symbol comes back as a Series
+            if not hasattr(closes, 'columns'):
+                closes, volumes = closes.to_frame(symbols[0]), volumes.to_frame(symbols[0])
+        except Exception as e:
+            logger.error(f"Error fetching prices: {e}")
+            return {}
+
+        prices = {}
+        for symbol in symbols:
+            if symbol not in closes:
+                continue
+            series = closes[symbol].dropna()
+            if len(series) < 2:
+                continue
+            current_price, prev_price = float(series.iloc[-1]), float(series.iloc[-2])
+            change = current_price - prev_price
+            volume = volumes[symbol].dropna()
+            prices[symbol] = {
+                'symbol': symbol,
+                'current_price': round(current_price, 2),
+                'change': round(change, 2),
+                'change_percent': round(change / prev_price * 100, 2),
+                'volume': int(volume.iloc[-1]) if len(volume) else 0
+            }
+        return prices
+
     def get_historical_data(self, symbol: str, period: str = "1mo") -> List[Dict]:
         """
         Fetch historical price data
@@ -77,6 +115,25 @@ class StockDataFetcher:
             logger.error(f"Error fetching historical data for {symbol}: {e}")
             return []
     
+    def get_close_history(self, symbols: List[str], period: str = "6mo"):
+        """
+        Fetch daily closing prices for many symbols in one batched download
+        Returns: DataFrame indexed by date with one column per symbol, or None
+        """
+        try:
+            hist = yf.download(symbols, period=period, progress=False, threads=True)
+            if hist.empty:
+                logger.warning("No historical data available for correlation panel")
+                return None
+            closes = hist['Close']
+            # A single symbol comes back as a Series
+            if not hasattr(closes, 'columns'):
+                closes = closes.to_frame(symbols[0])
+            return closes.dropna(axis=1, how='all')
+        except Exception as e:
+            logger.error(f"Error fetching close history: {e}")
+            return None
+
     def get_multiple_stocks(self, symbols: List[str]) -> Dict[str, Dict]:
         """Fetch data for multiple stocks at once"""
         results = {}
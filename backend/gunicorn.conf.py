@@ -0,0 +1,40 @@
+# Gunicorn settings for running the API with uvicorn workers.
+#
+# PRELOAD=1 imports the app and loads the read-only data (model weights,
+# price history panel) once in the master; workers are then forked and share
+# those pages copy-on-write instead of each loading their own copy.
+import gc
+import logging
+import os
+
+from app.utils.memory import memory_report
+
+logger = logging.getLogger("gunicorn.error")
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+# Workers share predictions, graphs and job state through Redis. Without it
+# each worker would keep (and refresh) its own copy, so default to one.
+workers = int(os.getenv("WEB_CONCURRENCY", 2 if os.getenv("REDIS_URL") else 1))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = os.getenv("PRELOAD", "1") == "1"
+timeout = int(os.getenv("WORKER_TIMEOUT", 120))
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from app.container import container
+    container.preload()
+    # Move everything loaded so far out of the GC's reach so collections in
+    # the workers don't write to (and un-share) those pages
+    gc.freeze()
+    logger.info("Preloaded %s; master memory %s", container.loaded(), memory_report())
+
+
+def post_fork(server, worker):
+    # Lets /health/memory find the sibling workers
+    os.environ["GUNICORN_MASTER_PID"] = str(server.pid)
+
+
+def post_worker_init(worker):
+    logger.info("Worker %s memory %s", worker.pid, memory_report())
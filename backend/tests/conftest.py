@@ -0,0 +1,5 @@
+import os
+
+# No Redis: the shared store is in-process and Celery runs jobs eagerly
+for var in ("REDIS_URL", "CELERY_BROKER_URL", "CELERY_RESULT_BACKEND"):
+    os.environ.pop(var, None)
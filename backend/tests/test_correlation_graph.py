@@ -0,0 +1,57 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from app.ml.correlation_graph import (
+    BINARY_FORMAT_VERSION, BINARY_HEADER, BINARY_MAGIC, LEVEL_SECTORS, LEVEL_STOCKS,
+    CorrelationGraphService,
+)
+
+
+class FakeFetcher:
+    """Random walks sharing a market factor, so many pairs correlate"""
+
+    def get_close_history(self, symbols, period="6mo"):
+        rng = np.random.default_rng(0)
+        market = rng.normal(size=(120, 1))
+        returns = market + 0.5 * rng.normal(size=(120, len(symbols)))
+        return pd.DataFrame(100 + np.cumsum(returns, axis=0), columns=symbols)
+
+
+def decode(payload):
+    magic, format_version, level, version, n_nodes, n_edges, n_labels = BINARY_HEADER.unpack_from(payload)
+    offset = BINARY_HEADER.size
+    positions = np.frombuffer(payload, dtype='<f4', count=n_nodes * 3, offset=offset).reshape(-1, 3)
+    offset += positions.nbytes
+    endpoints = np.frombuffer(payload, dtype='<u4', count=n_edges * 2, offset=offset).reshape(-1, 2)
+    offset += endpoints.nbytes
+    weights = np.frombuffer(payload, dtype='<f4', count=n_edges, offset=offset)
+    offset += weights.nbytes
+    labels = json.loads(payload[offset:offset + n_labels].decode('utf-8'))
+    assert offset + n_labels == len(payload)
+    return magic, format_version, level, version, positions, endpoints, weights, labels
+
+
+def test_stock_binary_round_trips_the_json_view():
+    service = CorrelationGraphService(FakeFetcher())
+    view = service.get_stock_view()
+    magic, format_version, level, version, positions, endpoints, weights, labels = decode(service.get_binary())
+
+    assert (magic, format_version, level, version) == (BINARY_MAGIC, BINARY_FORMAT_VERSION, LEVEL_STOCKS, view['version'])
+    assert len(view['links']) > 0
+    assert labels == [node['symbol'] for node in view['nodes']]
+    np.testing.assert_allclose(positions, [[n['x'], n['y'], n['z']] for n in view['nodes']], rtol=1e-6)
+    assert endpoints.tolist() == [[l['source'], l['target']] for l in view['links']]
+    np.testing.assert_allclose(weights, [l['correlation'] for l in view['links']], rtol=1e-6)
+
+
+def test_sector_binary_labels_sectors():
+    service = CorrelationGraphService(FakeFetcher())
+    view = service.get_sector_view()
+    _, _, level, _, positions, endpoints, weights, labels = decode(service.get_binary("sectors"))
+
+    assert level == LEVEL_SECTORS
+    assert labels == [node['sector'] for node in view['nodes']]
+    assert len(positions) == len(view['nodes'])
+    assert len(endpoints) == len(weights) == len(view['links'])
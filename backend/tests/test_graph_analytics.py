@@ -0,0 +1,57 @@
+import asyncio
+from unittest import mock
+
+import numpy as np
+
+from app.ml.correlation_graph import CorrelationGraphService
+from app.ml.graph_analytics import GraphAnalytics, compute_mst, publish_analytics
+from app.utils.shared_store import MemoryStore
+
+
+class NoHistory:
+    def get_close_history(self, symbols, period="6mo"):
+        return None
+
+
+def test_mst_spans_stocks_with_no_link_above_threshold():
+    correlations = np.array([
+        [1.0, 0.9, 0.1],
+        [0.9, 1.0, 0.2],
+        [0.1, 0.2, 1.0],
+    ])
+    assert sorted(compute_mst(correlations)) == [(0, 1, 0.9), (1, 2, 0.2)]
+
+
+def test_mst_skips_unknown_correlations():
+    correlations = np.array([
+        [1.0, 0.9, np.nan],
+        [0.9, 1.0, np.nan],
+        [np.nan, np.nan, 1.0],
+    ])
+    assert compute_mst(correlations) == [(0, 1, 0.9)]
+
+
+def test_contagion_path_crosses_sectors():
+    service = CorrelationGraphService(NoHistory())
+    graph = service.get_graph()
+    # The sector fallback has no links between sectors at all
+    assert all(graph.nodes[a]['sector'] == graph.nodes[b]['sector'] for a, b, _ in graph.edges)
+
+    ids = {node['symbol']: node['id'] for node in graph.nodes}
+    result = GraphAnalytics(service).contagion_path(graph, ids['RELIANCE.NS'], ids['TCS.NS'])
+    assert result is not None
+    assert result['path'][0] == ids['RELIANCE.NS'] and result['path'][-1] == ids['TCS.NS']
+
+
+def test_published_analytics_are_served_without_recomputing():
+    store = MemoryStore()
+    graph = CorrelationGraphService(NoHistory(), store=store).rebuild()
+    published = publish_analytics(store, graph)
+
+    # A web worker's service adopts the same snapshot and its analytics
+    analytics = GraphAnalytics(CorrelationGraphService(NoHistory(), store=store), store=store)
+    with mock.patch("app.ml.graph_analytics.get_process_pool", side_effect=AssertionError("recomputed")):
+        served, communities = asyncio.run(analytics.communities())
+
+    assert served.version == graph.version
+    assert communities == published['communities']
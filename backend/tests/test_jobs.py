@@ -0,0 +1,88 @@
+from unittest import mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.container import container
+from app.data.indian_stocks import get_all_stocks
+from app.main import app
+from app.tasks import TASKS
+from app.utils.shared_store import MemoryStore
+
+
+class FakeFetcher:
+    """Offline prices so the refresh job needs no network"""
+
+    def get_stock_price(self, symbol):
+        return {"symbol": symbol, "name": symbol, "current_price": 100.0}
+
+    def get_stock_prices(self, symbols):
+        return {symbol: {"symbol": symbol, "current_price": 100.0} for symbol in symbols}
+
+
+@pytest.fixture
+def client():
+    container.override("fetcher", FakeFetcher())
+    # A fresh store per test, so dedup entries don't leak between tests
+    container.override("store", MemoryStore())
+    yield TestClient(app)
+    container.reset("fetcher")
+    container.reset("store")
+
+
+def test_job_runs_eagerly_and_can_be_polled(client):
+    response = client.post("/api/jobs", json={"task": "predictions.refresh"})
+    assert response.status_code == 202
+    job = response.json()
+    assert job["deduplicated"] is False
+
+    status = client.get(f"/api/jobs/{job['job_id']}").json()
+    assert status["status"] == "SUCCESS"
+    assert status["task"] == "predictions.refresh"
+    assert len(status["result"]) == len(get_all_stocks())
+
+    # The job's predictions are what the leaderboard serves. Changes are
+    # rounded, so compare the moves: tied tickers may be ordered differently
+    movers = client.get("/api/predictions/top-movers", params={"limit": 5}).json()
+    assert [abs(m["predicted_change"]) for m in movers] == \
+        [abs(p["predicted_change"]) for p in status["result"][:5]]
+    result = {p["ticker"]: p for p in status["result"]}
+    assert all(result[m["ticker"]] == m for m in movers)
+
+
+def test_identical_pending_job_is_deduplicated(client):
+    with mock.patch.object(TASKS["graph.rebuild"], "apply_async") as apply_async:
+        first = client.post("/api/jobs", json={"task": "graph.rebuild"}).json()
+        second = client.post("/api/jobs", json={"task": "graph.rebuild"}).json()
+
+    assert apply_async.call_count == 1
+    assert second == {**first, "deduplicated": True}
+    assert client.get(f"/api/jobs/{first['job_id']}").json()["status"] == "PENDING"
+
+
+def test_invalid_params_are_rejected_without_claiming(client):
+    params = {"task": "explanations.prefetch", "params": {"bogus": 1}}
+    assert client.post("/api/jobs", json=params).status_code == 400
+    assert client.post("/api/jobs", json=params).status_code == 400
+
+
+def test_unknown_job_is_not_found(client):
+    assert client.get("/api/jobs/does-not-exist").status_code == 404
+    assert client.post("/api/jobs", json={"task": "nope"}).status_code == 400
+
+
+def test_prefetch_only_explains_server_side_predictions(client):
+    gemini = mock.Mock()
+    gemini.generate_prediction_explanation.side_effect = lambda **kwargs: f"{kwargs['stock_name']} at {kwargs['current_price']}"
+    container.override("gemini", gemini)
+    try:
+        forged = {"ticker": "TCS", "name": "Fake", "current_price": 1.0, "predicted_change": 9.0, "sector": "IT"}
+        response = client.post("/api/jobs", json={"task": "explanations.prefetch", "params": {"predictions": [forged]}})
+        assert response.status_code == 400
+
+        client.post("/api/jobs", json={"task": "predictions.refresh"})
+        job = client.post("/api/jobs", json={"task": "explanations.prefetch", "params": {"tickers": ["TCS", "NOPE"]}}).json()
+        result = client.get(f"/api/jobs/{job['job_id']}").json()["result"]
+        assert result == {"TCS": "Tata Consultancy Services at 100.0"}
+    finally:
+        container.reset("gemini")
@@ -0,0 +1,57 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.ml.leaderboard import PredictionLeaderboard
+
+
+def prediction(ticker, change, sector="IT"):
+    return {"ticker": ticker, "sector": sector, "predicted_change": change}
+
+
+def tickers(predictions):
+    return [p["ticker"] for p in predictions]
+
+
+def test_update_re_ranks_in_place():
+    board = PredictionLeaderboard()
+    board.update(prediction("A", 1.0))
+    board.update(prediction("B", -3.0))
+    board.update(prediction("C", 2.0))
+    assert tickers(board.top_movers(3)) == ["B", "C", "A"]
+
+    board.update(prediction("A", 5.0))
+    assert tickers(board.top_movers(2)) == ["A", "B"]
+    assert len(board) == 3
+
+
+def test_sector_change_moves_ticker_between_sector_indexes():
+    board = PredictionLeaderboard()
+    board.update(prediction("A", 1.0, "IT"))
+    board.update(prediction("B", 2.0, "IT"))
+    board.update(prediction("A", 4.0, "Banking"))
+
+    assert tickers(board.top_movers(10, "IT")) == ["B"]
+    assert tickers(board.top_movers(10, "Banking")) == ["A"]
+    assert tickers(board.top_movers(10)) == ["A", "B"]
+
+    board.remove("A")
+    assert board.top_movers(10, "Banking") == []
+    assert tickers(board.top_movers(10)) == ["B"]
+
+
+def test_gainers_and_losers_exclude_the_other_direction():
+    board = PredictionLeaderboard()
+    for ticker, change in [("A", 3.0), ("B", 0.0), ("C", -1.0), ("D", 1.0)]:
+        board.update(prediction(ticker, change))
+
+    assert tickers(board.top_gainers(10)) == ["A", "D"]
+    assert tickers(board.top_losers(10)) == ["C"]
+    assert tickers(board.top_gainers(1)) == ["A"]
+    assert board.top_losers(10, "Unknown sector") == []
+
+
+def test_top_movers_rejects_unknown_view():
+    client = TestClient(app)
+    response = client.get("/api/predictions/top-movers", params={"view": "sideways"})
+    assert response.status_code == 400
+    assert client.get("/api/predictions/top-movers", params={"view": "gainers"}).status_code == 200